@@ -1,16 +1,20 @@
 # borrowed from @Longpoke http://stackoverflow.com/questions/1092531/event-system-in-python/2022629#2022629
+import threading
 
-class Event(list):
+class Event(object):
     """Event subscription.
 
-    A list of callable objects. Calling an instance of this will cause a
-    call to each item in the list in ascending order by index.
+    A sequence of callable objects. Calling an instance of this will cause a
+    call to each item in ascending order by index.
+
+    Handlers are held in a tuple that is replaced on every change, so firing
+    the event needs no lock and no copy even while another thread subscribes.
 
     Example Usage:
     >>> def f(x):
-    ...     print 'f(%s)' % x
+    ...     print('f(%s)' % x)
     >>> def g(x):
-    ...     print 'g(%s)' % x
+    ...     print('g(%s)' % x)
     >>> e = Event()
     >>> e()
     >>> e.append(f)
@@ -18,7 +22,8 @@ class Event(list):
     f(123)
     >>> e.remove(f)
     >>> e()
-    >>> e += (f, g)
+    >>> e += f
+    >>> e += g
     >>> e(10)
     f(10)
     g(10)
@@ -27,12 +32,41 @@ class Event(list):
     g(2)
 
     """
+    def __init__(self, handlers=()):
+        self._handlers = tuple(handlers)
+        self._lock = threading.Lock()
+
     def __call__(self, *args, **kwargs):
-        for f in self:
+        for f in self._handlers:
             f(*args, **kwargs)
 
     def __repr__(self):
-        return "Event(%s)" % list.__repr__(self)
+        return "Event(%r)" % list(self._handlers)
+
+    def __iter__(self):
+        return iter(self._handlers)
+
+    def __len__(self):
+        return len(self._handlers)
+
+    def __getitem__(self, index):
+        return self._handlers[index]
+
+    def __delitem__(self, index):
+        with self._lock:
+            handlers = list(self._handlers)
+            del handlers[index]
+            self._handlers = tuple(handlers)
+
+    def append(self, event):
+        with self._lock:
+            self._handlers = self._handlers + (event,)
+
+    def remove(self, event):
+        with self._lock:
+            handlers = list(self._handlers)
+            handlers.remove(event)
+            self._handlers = tuple(handlers)
 
     def __iadd__(self, event):
         self.append(event)
@@ -5,11 +5,11 @@ from datetime import datetime
 USE_LOGFILE=False
 
 approot = os.path.dirname(os.path.realpath(__file__))
-logdir = os.path.join(approot, 'logs')
-if not os.path.exists(logdir):
-    os.makedirs(logdir)
 
 if USE_LOGFILE:
+    logdir = os.path.join(approot, 'logs')
+    if not os.path.exists(logdir):
+        os.makedirs(logdir)
     logfile = os.path.join(logdir, datetime.now().strftime("%Y-%m") + '.log')
     print('logfile: ', logfile)
     logging.basicConfig(
@@ -1,14 +1,37 @@
 import threading
-import re
+import hashlib
+import json
+import os
+import selectors
+import tempfile
 import time
+from collections import OrderedDict
 from . log import logging
 from . event import Event
-from serial import Serial
-from yaml import load, dump
+from serial import Serial, SerialException
+from yaml import load
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
 logger = logging.getLogger('onkyo-serial')
 logger.setLevel(logging.DEBUG)
 
+_PREFIX, _SUFFIX = b'!1', b'\r'
+
+# two-digit hex volume levels as sent by the receiver
+_VOL_TABLE = {format(i, fmt).encode('ascii'): i for i in range(256) for fmt in ('02X', '02x')}
+
+# most unterminated input kept while waiting for a frame's ^Z
+_MAX_FRAME_BUFFER = 512
+
+# per-user cache, the package directory may not be writable
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'onkyo-serial'
+)
+
 SOURCES = {
     "00": "VIDEO1,VCR/DVR,STB/DVR",
     "01": "VIDEO2,CBL/SAT",
@@ -43,8 +66,168 @@ SOURCES = {
 }
 
 
+def _load_yaml_cached(data):
+    """Parse YAML bytes, reusing a JSON copy cached under the hash of the content."""
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    cached = os.path.join(CACHE_DIR, digest + '.json')
+    try:
+        with open(cached, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    config = load(data, Loader=_Loader)
+    try:
+        out = json.dumps(config)
+    except (TypeError, ValueError):
+        out = None
+    # JSON turns non-string keys (e.g. on:, 1:) into strings; only cache what round-trips
+    if out is None or json.loads(out) != config:
+        logger.debug('Config is not JSON round-trippable, not caching')
+        return config
+
+    tmp = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(out)
+        os.replace(tmp, cached)
+    except OSError:
+        logger.debug('Unable to cache config to %s', cached)
+        if tmp and os.path.exists(tmp):
+            os.remove(tmp)
+    return config
+
+
+def load_config(yaml_path):
+    """Load a YAML config file, using the JSON cache on warm starts."""
+    with open(yaml_path, 'rb') as f:
+        return _load_yaml_cached(f.read())
+
+
+def _power(value):
+    """Process power state."""
+    return value == b'01'
+
+
+def _mute(value):
+    """Process mute status."""
+    return value == b'01'
+
+
+def _volume(value):
+    """Process volume state, None if the value is not a two digit hex level."""
+    return _VOL_TABLE.get(value)
+
+
+def _source_factory(sources):
+    """Build the handler for the current input source."""
+    by_code = {code.encode('ascii'): aliases for code, aliases in sources.items()}
+    return by_code.get
+
+
+class FrameParser(object):
+    r"""Splits raw serial bytes into (command, value) pairs, one pass per byte.
+
+    Partial frames stay buffered until their ^Z arrives. Segments without a
+    '!1' frame, and N/A replies to queries the receiver cannot answer (e.g.
+    while a zone is in standby), are logged and dropped. Unterminated input
+    beyond _MAX_FRAME_BUFFER bytes is discarded up to the last '!1'.
+
+    Example Usage:
+    >>> p = FrameParser()
+    >>> p.feed(b'!1PWR01\x1a\r\n!1MV')
+    [(b'PWR', b'01')]
+    >>> p.feed(b'L2A\x1a')
+    [(b'MVL', b'2A')]
+    >>> p.feed(b'!1AMT\x1a')
+    [(b'AMT', None)]
+    >>> p.feed(b'\r\nnoise\x1a!1SLI03\x1a')
+    [(b'SLI', b'03')]
+    >>> p.feed(b'!1MVLN/A\x1a')
+    []
+    >>> p.buf
+    bytearray(b'')
+    >>> p.feed(b'\r\n' * 300)
+    []
+    >>> p.buf
+    bytearray(b'')
+    >>> p.feed(b'x' * 600 + b'!1PW')
+    []
+    >>> p.buf
+    bytearray(b'!1PW')
+    >>> p.feed(b'R01\x1a')
+    [(b'PWR', b'01')]
+
+    """
+    __slots__ = ('buf',)
+
+    def __init__(self):
+        self.buf = bytearray()
+
+    def feed(self, data):
+        """Append bytes read from the port and return the complete frames received."""
+        buf = self.buf
+        buf += data
+        frames = []
+        start = 0
+        while True:
+            end = buf.find(b'\x1a', start)
+            if end < 0:
+                break
+            # frames are !1 + 3 letter command + optional 2 character value + ^Z
+            if buf.startswith(b'!1', start):
+                begin = start
+            else:
+                begin = buf.find(b'!1', start, end)
+            if begin >= 0 and buf.startswith(b'N/A', begin + 5):
+                logger.debug('Received N/A response: %s', bytes(buf[begin:end + 1]))
+            elif begin >= 0 and end - begin >= 5:
+                val = bytes(buf[begin + 5:begin + 7]) if end - begin >= 7 else None
+                frames.append((bytes(buf[begin + 2:begin + 5]), val))
+            else:
+                logger.debug('Received unknown response: %s', bytes(buf[start:end + 1]))
+            start = end + 1
+        del buf[:start]
+        if len(buf) > _MAX_FRAME_BUFFER:
+            # no terminator in sight (wrong baud rate, CR/LF-only replies), keep only a possible frame start
+            begin = buf.rfind(b'!1')
+            if begin < 0 or len(buf) - begin > _MAX_FRAME_BUFFER:
+                begin = len(buf)
+            logger.debug('Discarding %d bytes without a frame terminator', begin)
+            del buf[:begin]
+        return frames
+
+
 class OnkyoBackgroundWorker(threading.Thread):
-    """Listens for incoming messages from the serial port and updates status in the background."""
+    r"""Listens for incoming messages from the serial port and updates status in the background.
+
+    Responses that cannot be parsed are logged and skipped without stopping the thread.
+
+    Example Usage:
+    >>> class Port(object):
+    ...     def __init__(self, data):
+    ...         self.data = [data]
+    ...     def read_until(self, terminator):
+    ...         if self.data:
+    ...             return self.data.pop()
+    ...         time.sleep(0.01)
+    ...         return b''
+    >>> config = {'master': {'commands': {'volume': 'MVL', 'source': 'SLI'}}}
+    >>> seen = []
+    >>> def changed(zone, prop, value):
+    ...     seen.append((zone, prop, value))
+    >>> w = OnkyoBackgroundWorker(Port(b'!1MVLN/A\x1a!1SLIZZ\x1a!1MVL\x1a!1MVL2A\x1a'), config, SOURCES)
+    >>> w.state_changed += changed
+    >>> w.start()
+    >>> time.sleep(0.1)
+    >>> w.is_alive(), seen
+    (True, [('master', 'volume', 42)])
+    >>> w.state_changed -= changed
+
+    """
+    __slots__ = ('_port', '_cmd_to_zone_prop', '_parser', '_selector', '_handlers')
     state_changed = Event()
 
     def __init__(self, port, commands, sources):
@@ -52,87 +235,79 @@ class OnkyoBackgroundWorker(threading.Thread):
         threading.Thread.__init__(self)
         self.daemon = True
         self._port = port
-        self._commands = commands
-        self._pattern = '!1([A-Z]{3})(.{2})?'
-        self._sources = sources
-
-        self.messages = {
-            'power': self.power,
-            'volume': self.volume,
-            'source': self.source,
-            'mute': self.mute
+        # first zone to declare a command code owns its responses
+        self._cmd_to_zone_prop = {}
+        for z, zc in commands.items():
+            for prop, cmd in zc['commands'].items():
+                self._cmd_to_zone_prop.setdefault(cmd.encode('ascii'), (z, prop))
+
+        # wait on the port with epoll/kqueue where it exposes a file descriptor
+        self._parser = FrameParser()
+        try:
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(port.fileno(), selectors.EVENT_READ)
+        except (AttributeError, OSError, ValueError):
+            self._selector = None
+
+        self._handlers = {
+            'power': _power,
+            'volume': _volume,
+            'source': _source_factory(sources),
+            'mute': _mute
         }
 
-    def _readline(self):
-        """Read a single line from the serial port suffixed with a ^Z."""
-        eol = b'\x1a'
-        leneol = len(eol)
-        line = bytearray()
-        while True:
-            cread = self._port.read(1)
-            if cread:
-                line += cread
-                if line[-leneol:] == eol:
-                    break
-            else:
-                break
-
-        return bytes(line)
-
-    def process(self, message, value):
-        """Call the process handler for a specific message."""
-        return self.messages[message](value)
-
-    #pylint: disable=R
-    def power(self, value):
-        """Process power state."""
-        return value == '01'
-
-    def mute(self, value):
-        """Process mute status."""
-        return value == '01'
-
-    def volume(self, value):
-        """Process volume state."""
-        return int(value, 16)
-
-    def source(self, value):
-        """Process the current input source."""
-        return self._sources[value]
+    def register_port(self):
+        """Re-register the port with the selector after it has been reopened."""
+        if self._selector is None:
+            return
+        for key in list(self._selector.get_map().values()):
+            self._selector.unregister(key.fd)
+        self._selector.register(self._port.fileno(), selectors.EVENT_READ)
+
+    def _read(self):
+        """Read whatever the serial port has available, waiting for at least one byte."""
+        if self._selector is None:
+            try:
+                return self._port.read_until(b'\x1a')
+            except SerialException:
+                if self._port.is_open:
+                    raise
+                # closed port, wait for connect() to reopen it
+                time.sleep(1)
+                return b''
+
+        self._selector.select()
+        return self._port.read(self._port.in_waiting or 1)
 
     def run(self):
         """Override run handler for the thread."""
         logger.info('Starting background worker for Onkyo Serial Device')
         while True:
-            out = self._readline().decode('utf-8')
-            match = re.search(self._pattern, out)
-            if match:
-                cmd = match.group(1)
-                val = match.group(2)
-                zone = None
-                prop = None
-
-                #pylint: disable=C,W
-                for z, c in self._commands.items():
-                    for child_key, child_cmd in self._commands[z]['commands'].items():
-                        if child_cmd == cmd:
-                            zone = z
-                            prop = child_key
-                            break
-
-                if zone and prop:
-                    if prop in self.messages:
-                        val = self.process(prop, val)
-                        logger.debug('zone: %s, property: %s, value: %s', zone, prop, val)
+            for cmd, val in self._parser.feed(self._read()):
+                zp = self._cmd_to_zone_prop.get(cmd)
+                if zp:
+                    zone, prop = zp
+                    handler = self._handlers.get(prop)
+                    try:
+                        parsed = handler(val) if handler else None
+                    except (KeyError, TypeError, ValueError):
+                        parsed = None
+                    if parsed is not None:
+                        val = parsed
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug('zone: %s, property: %s, value: %s', zone, prop, val)
                         self.state_changed(zone, prop, val)
                     else:
-                        logger.debug('Received unknown response: %s', match.group())
-            else:
-                logger.debug('Received unknown response: %s', out)
+                        logger.debug('Received unknown response: %s %s', cmd, val)
 
 class OnkyoSerial():
+    __slots__ = ('on_state_change', '_sources', '_alias_to_code', '_zone', '_queries', '_commands', '_attr_map',
+                 '_power_on_cmd', '_power_off_cmd', '_mute_on_cmd', '_mute_off_cmd',
+                 '_power', '_volume', '_source', '_mute')
     _serial = None
     _worker_thread = None
+    _alias_maps = OrderedDict()
+    _alias_maps_size = 8
 
     @property
     def _port(self):
@@ -144,14 +319,45 @@ class OnkyoSerial():
         """Worker thread."""
         return type(self)._worker_thread
 
+    @classmethod
+    def _alias_map(cls, sources):
+        """Source alias -> input code map, shared by every zone using the same sources table.
+
+        The most recently used tables are kept, up to _alias_maps_size.
+        """
+        cached = cls._alias_maps.get(id(sources))
+        if cached and cached[0] is sources:
+            cls._alias_maps.move_to_end(id(sources))
+            return cached[1]
+
+        alias_map = {
+            alias.strip().upper(): code.encode('ascii')
+            for code, aliases in sources.items()
+            for alias in aliases.split(',')
+        }
+        # keep a reference to sources so its id cannot be reused while cached
+        cls._alias_maps[id(sources)] = (sources, alias_map)
+        cls._alias_maps.move_to_end(id(sources))
+        while len(cls._alias_maps) > cls._alias_maps_size:
+            cls._alias_maps.popitem(last=False)
+        return alias_map
+
     def __init__(self, config, zone, sources=SOURCES, port='/dev/ttyUSB0', baudrate=9600, timeout=10, rtscts=0, xonxoff=0):
         """Initialize an instance of the Onkyo class to manage communication with the Onkyo receiver."""
         self.on_state_change = Event()
         self._sources = sources
-        self._reverse_sources = {value: key for key, value in sources.items()}
+        self._alias_to_code = self._alias_map(sources)
         self._zone = zone
-        self._queries = list(config[zone]['queries'].values())
-        self._commands = config[zone]['commands']
+        self._queries = [q.encode('ascii') for q in config[zone]['queries'].values()]
+        self._commands = {k: v.encode('ascii') for k, v in config[zone]['commands'].items()}
+
+        self._attr_map = {'power': '_power', 'volume': '_volume', 'source': '_source', 'mute': '_mute'}
+
+        # fully framed commands for the fixed on/off writes
+        self._power_on_cmd = self._frame('power', b'01')
+        self._power_off_cmd = self._frame('power', b'00')
+        self._mute_on_cmd = self._frame('mute', b'01')
+        self._mute_off_cmd = self._frame('mute', b'00')
 
         if not self._port:
             OnkyoSerial._serial = Serial(port, baudrate=baudrate, timeout=timeout, rtscts=rtscts, xonxoff=xonxoff)
@@ -167,71 +373,88 @@ class OnkyoSerial():
         self._source = None
         self._mute = False
 
+    def _frame(self, name, value):
+        """Build the framed bytes for a zone command and value, or None if the zone lacks it."""
+        if name in self._commands:
+            return _PREFIX + self._commands[name] + value + _SUFFIX
+        return None
+
+    def _write(self, out):
+        """Write framed bytes to an open serial port."""
+        logger.debug('Writing command: %s', out)
+        try:
+            self._port.write(out)
+        except SerialException:
+            if self._port.is_open:
+                raise
+            logger.debug('Attempt to write command when port is not open.')
+
+    def connect(self):
+        """Reopen the shared serial port if it has been closed."""
+        if not self._port.is_open:
+            self._port.open()
+            self._worker.register_port()
+
     def command(self, command):
         """Write a command to an open serial port."""
-        if self._port.isOpen():
-            out = ''.join(['!1', command, '\r'])
-            logger.debug('Writing command: %s', out)
-            self._port.write(str.encode(out))
-        else:
-            logger.debug('Attempt to write command when port is not open.')
+        if isinstance(command, str):
+            command = command.encode('ascii')
+        self._write(_PREFIX + command + _SUFFIX)
+
+    def commands_bulk(self, commands):
+        """Write several bytes commands to an open serial port in a single write."""
+        self._write(b''.join(_PREFIX + c + _SUFFIX for c in commands))
 
     def update(self):
         """Post an update to the port and let the background worker signal any updates."""
-        for query in self._queries:
-            self.command(query)
+        self.commands_bulk(self._queries)
 
     def state_change(self, zone, prop, value):
         """Handle a state change from the worker thread."""
         if zone == self._zone:
-            logger.debug("state change [{z}] {k}={v}".format(z=zone, k=prop, v=value))
-            self.__dict__['_' + prop] = value
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('state change [%s] %s=%s', zone, prop, value)
+            setattr(self, self._attr_map[prop], value)
             self.on_state_change(prop, value)
 
     def power_on(self):
         """Send power on command."""
-        if 'power' in self._commands:
-            self.command(self._commands['power'] + '01')
+        if self._power_on_cmd:
+            self._write(self._power_on_cmd)
 
     def power_off(self):
         """Send power off command."""
-        if 'power' in self._commands:
-            self.command(self._commands['power'] + '00')
+        if self._power_off_cmd:
+            self._write(self._power_off_cmd)
 
     def mute_on(self):
         """Send mute command."""
-        if 'mute' in self._commands:
-            self.command(self._commands['mute'] + '01')
+        if self._mute_on_cmd:
+            self._write(self._mute_on_cmd)
 
     def mute_off(self):
         """Send mute off command."""
-        if 'mute' in self._commands:
-            self.command(self._commands['mute'] + '00')
+        if self._mute_off_cmd:
+            self._write(self._mute_off_cmd)
 
     def volume(self, level):
         """Send volume level command."""
         if 'volume' in self._commands:
-            self.command(self._commands['volume'] + format(level, '02X'))
+            self.command(self._commands['volume'] + b'%02X' % level)
 
     def raw(self, command):
         self.command(command)
 
     def source(self, input):
         """Send set input source command."""
-        if 'source' in self._commands:
-            sel = self._reverse_sources.get(input.upper(), None)
-            if not sel:
-                for key, val in self._reverse_sources.items():
-                    if input.upper() in key.split(','):
-                        sel = self._reverse_sources[key]
-
-            if sel:
-                self.command(self._commands['source'] + sel)
+        code = self._alias_to_code.get(input.upper())
+        if code and 'source' in self._commands:
+            self.command(self._commands['source'] + code)
 
 
 if __name__ == '__main__':
 
-    config = load("""
+    config = _load_yaml_cached(b"""
 master:
     commands:
         power:  'PWR'